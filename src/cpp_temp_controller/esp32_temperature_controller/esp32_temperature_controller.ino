@@ -30,6 +30,19 @@
 #include <SPIFFS.h>
 #include <WiFi.h>
 
+// Per-request serial logging; define DEBUG_MODE 1 to enable it
+#ifndef DEBUG_MODE
+#define DEBUG_MODE 0
+#endif
+
+#if DEBUG_MODE
+#define DEBUG_PRINTLN(...) Serial.println(__VA_ARGS__)
+#define DEBUG_PRINTF(...) Serial.printf(__VA_ARGS__)
+#else
+#define DEBUG_PRINTLN(...)
+#define DEBUG_PRINTF(...)
+#endif
+
 // Configuration
 const char *WIFI_SSID = "TempController";
 const char *WIFI_PASSWORD = "temp123456";
@@ -45,30 +58,167 @@ const float DEFAULT_TEMP_HIGH = 70.0; // Relay deactivation temperature
 const int DEFAULT_CHECK_INTERVAL = 2; // Reading interval in seconds
 const float MAX_TEMP = 80.0;          // Maximum safe temperature
 const float MIN_TEMP = 0.0;           // Minimum temperature
+const float TEMP_LOG_DELTA = 0.5;     // Change needed to log a new reading
+const int SENSOR_ERROR_LIMIT = 3;     // Failed reads before the relay is forced off
 
 // Configuration file
 const char *CONFIG_FILE = "/config.json";
+const unsigned long CONFIG_SAVE_DELAY_MS = 5000;      // Coalesce bursts of updates
+const unsigned long CONFIG_SAVE_MAX_DELAY_MS = 30000; // Longest a change stays unsaved
 
 // Data logging
 const int MAX_DATA_POINTS = 100; // Number of data points to keep in memory
 const char *DATA_FILE = "/temperature_data.json";
 
+// Dashboard stylesheet, stored gzip-compressed and served as /style.css.
+// After editing the source below, save it as style.css and regenerate with:
+//   gzip -9 -n -c style.css | xxd -i
+/*
+ * body{font-family:Arial,sans-serif;margin:20px;background:#f5f5f5}
+ * .container{max-width:800px;margin:0 auto;background:white;padding:20px;border-radius:10px}
+ * .header{text-align:center;margin-bottom:30px}
+ * .status-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(200px,1fr));gap:20px;margin-bottom:30px}
+ * .status-card{background:#f8f9fa;padding:20px;border-radius:8px;text-align:center}
+ * .temp-display{font-size:2.5em;font-weight:bold;color:#007bff}
+ * .relay-on{color:#28a745;font-weight:bold}
+ * .relay-off{color:#dc3545;font-weight:bold}
+ * .config-section{background:#f8f9fa;padding:20px;border-radius:8px;margin-bottom:20px}
+ * .form-group{margin-bottom:15px}
+ * .form-group label{display:block;margin-bottom:5px;font-weight:bold}
+ * .form-group input{width:100%;padding:8px;border:1px solid #ddd;border-radius:4px;box-sizing:border-box}
+ * .btn{background:#007bff;color:white;padding:10px 20px;border:none;border-radius:4px;cursor:pointer;margin-right:10px}
+ * .btn-danger{background:#dc3545}
+ * .btn-success{background:#28a745}
+ * .control-buttons{margin-top:20px}
+ */
+const uint8_t STYLE_CSS_GZ[] PROGMEM = {
+    0x1f, 0x8b, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00, 0x02, 0x03, 0x95, 0x53,
+    0xed, 0x6a, 0xe3, 0x30, 0x10, 0xfc, 0x7f, 0x4f, 0x11, 0x08, 0x07, 0x2d,
+    0x44, 0xc5, 0x49, 0x1b, 0xea, 0xca, 0xbf, 0xee, 0x51, 0xd6, 0xfa, 0x70,
+    0x96, 0xca, 0x92, 0x90, 0x64, 0xe2, 0xd4, 0xf4, 0xdd, 0x6f, 0x15, 0xab,
+    0xb9, 0x38, 0x0d, 0x85, 0x23, 0x10, 0xf0, 0xee, 0xce, 0xec, 0xec, 0xce,
+    0xaa, 0x75, 0xf2, 0x34, 0x69, 0x67, 0x13, 0xd3, 0xd0, 0xa3, 0x39, 0xf1,
+    0x3f, 0x01, 0xc1, 0x6c, 0x22, 0xd8, 0xc8, 0xa2, 0x0a, 0xa8, 0x9b, 0x1e,
+    0x42, 0x87, 0x96, 0xef, 0x2a, 0x3f, 0x36, 0x2d, 0x88, 0xf7, 0x2e, 0xb8,
+    0xc1, 0x4a, 0xbe, 0xd6, 0xfb, 0xfc, 0xfb, 0xfc, 0xf5, 0x24, 0x08, 0x0d,
+    0x68, 0x55, 0x98, 0x7a, 0x18, 0xd9, 0x11, 0x65, 0x3a, 0xf0, 0xba, 0xca,
+    0xe5, 0x05, 0x5a, 0xad, 0x60, 0x48, 0xee, 0x1a, 0x7c, 0x3c, 0x60, 0x52,
+    0x8d, 0x07, 0x29, 0xd1, 0x76, 0x85, 0xda, 0x05, 0xa9, 0x02, 0x0b, 0x20,
+    0x71, 0x88, 0x7c, 0x4b, 0x21, 0xa2, 0x3e, 0x28, 0xa0, 0xe0, 0x94, 0xd4,
+    0x98, 0x18, 0x18, 0xec, 0x2c, 0x17, 0xca, 0x26, 0x15, 0x0a, 0x33, 0x6b,
+    0x5d, 0x4a, 0xae, 0xe7, 0xcf, 0x73, 0x75, 0x4c, 0x90, 0x86, 0xc8, 0xba,
+    0x80, 0x72, 0x92, 0x18, 0xbd, 0x81, 0x13, 0xcf, 0x1f, 0x4d, 0xfe, 0x63,
+    0x49, 0xf5, 0x14, 0x49, 0x8a, 0x09, 0x67, 0x86, 0xde, 0x46, 0x1e, 0x94,
+    0x57, 0x90, 0x1e, 0xb2, 0x36, 0xa6, 0x31, 0x6d, 0x7a, 0xb4, 0x34, 0xc0,
+    0xc3, 0x2e, 0x4b, 0xdf, 0x6c, 0x75, 0x78, 0x7c, 0x6c, 0x3a, 0xf0, 0xb3,
+    0xba, 0x9f, 0xfa, 0x09, 0x08, 0x72, 0x5a, 0x6c, 0xa6, 0xd6, 0x6f, 0x1a,
+    0x7e, 0x1a, 0xaf, 0xa6, 0xc8, 0xb7, 0xa1, 0x88, 0x31, 0x6b, 0x64, 0x45,
+    0xfa, 0xec, 0x4a, 0xc4, 0x0f, 0xc5, 0x77, 0x4f, 0x7b, 0xd5, 0x37, 0xe7,
+    0xef, 0xa3, 0xc2, 0xee, 0x90, 0x78, 0xeb, 0x8c, 0x6c, 0x68, 0x10, 0x17,
+    0xf8, 0xba, 0xaa, 0x5e, 0x5b, 0xad, 0x09, 0x1d, 0x14, 0xc1, 0x98, 0xb3,
+    0x53, 0x49, 0xec, 0x6a, 0x78, 0x7d, 0xd9, 0x7f, 0xc3, 0xfd, 0xab, 0xd4,
+    0xfa, 0xab, 0x54, 0x8a, 0xe7, 0xfd, 0xfd, 0x52, 0x72, 0x57, 0x63, 0x47,
+    0xb7, 0x20, 0x12, 0x12, 0xf5, 0xff, 0xcf, 0xb9, 0x5c, 0xdd, 0x6e, 0x5e,
+    0x9d, 0x76, 0xa1, 0x67, 0x99, 0xc7, 0x4f, 0xcb, 0xfc, 0x76, 0x7f, 0x93,
+    0x5f, 0x19, 0x68, 0x95, 0xb9, 0xf8, 0xd9, 0x1a, 0x27, 0xde, 0x6f, 0x38,
+    0x09, 0x72, 0x4f, 0xf9, 0x15, 0x07, 0x5a, 0x3f, 0xa4, 0x69, 0x3e, 0xcd,
+    0x6d, 0x55, 0xfd, 0xbe, 0x68, 0xae, 0x2f, 0x92, 0xf9, 0xd6, 0x8f, 0xab,
+    0xe8, 0x0c, 0xca, 0xd5, 0x5a, 0x4a, 0x79, 0x33, 0xc8, 0xcb, 0xb9, 0x6e,
+    0xcc, 0x76, 0x64, 0x58, 0x49, 0x52, 0x84, 0xfa, 0xb4, 0x69, 0xb9, 0x96,
+    0xd9, 0x8f, 0xe2, 0xce, 0xf2, 0xd2, 0xf3, 0x59, 0xaf, 0xae, 0xf6, 0xc4,
+    0xad, 0xb3, 0xea, 0x4e, 0x2b, 0x31, 0x84, 0x48, 0x60, 0xef, 0xf0, 0xfa,
+    0xda, 0xc3, 0x79, 0xba, 0xf2, 0x34, 0xa8, 0x2b, 0x93, 0x60, 0x3b, 0x7a,
+    0x1e, 0xd7, 0xcd, 0x67, 0x23, 0x4b, 0x3e, 0x0e, 0x42, 0xa8, 0x18, 0x17,
+    0x05, 0xf3, 0x51, 0x94, 0x67, 0x1b, 0x9c, 0x61, 0xed, 0x40, 0x4b, 0xb4,
+    0xf1, 0xcb, 0x87, 0xe4, 0x7c, 0x31, 0xe9, 0x2f, 0xa6, 0x1e, 0x7d, 0x71,
+    0x1b, 0x04, 0x00, 0x00,
+};
+
+// Web interface, served straight from flash. The page is fully static; live
+// values are filled in by the script from the /api endpoints.
+const char INDEX_HTML[] PROGMEM = R"rawliteral(<!DOCTYPE html>
+<html><head><title>ESP32 Temperature Controller</title>
+<link rel='stylesheet' href='/style.css'>
+</head><body>
+<div class='container'>
+<div class='header'><h1>🌡️ ESP32 Temperature Controller</h1><p>Professional High-Temperature Monitoring System</p></div>
+<div class='status-grid'>
+<div class='status-card'><h3>Current Temperature</h3><div class='temp-display' id='currentTemp'>--</div></div>
+<div class='status-card'><h3>Relay Status</h3><div id='relayStatus'>--</div></div>
+<div class='status-card'><h3>Controller</h3><div id='controllerStatus'>--</div></div>
+<div class='status-card'><h3>Sensor</h3><div id='sensorStatus'>--</div></div>
+</div>
+<div class='config-section'>
+<h2>Configuration</h2>
+<form id='configForm'>
+<div class='form-group'><label for='tempLow'>Temperature Low (Activate Relay) °C:</label><input type='number' id='tempLow' step='0.1' min='0' max='120' required></div>
+<div class='form-group'><label for='tempHigh'>Temperature High (Deactivate Relay) °C:</label><input type='number' id='tempHigh' step='0.1' min='0' max='120' required></div>
+<div class='form-group'><label for='checkInterval'>Reading Interval (seconds):</label><input type='number' id='checkInterval' min='1' max='60' required></div>
+<button type='submit' class='btn'>Save Configuration</button>
+<button type='button' class='btn' onclick='loadConfig()'>Load Current</button>
+</form></div>
+<div class='control-buttons'>
+<button class='btn btn-success' onclick='controlAction("start")'>Start Controller</button>
+<button class='btn btn-danger' onclick='controlAction("stop")'>Stop Controller</button>
+<button class='btn' onclick='controlAction("relay_on")'>Relay ON</button>
+<button class='btn' onclick='controlAction("relay_off")'>Relay OFF</button>
+</div></div>
+<script>
+loadStatus();loadConfig();setInterval(loadStatus,5000);
+function loadStatus(){fetch('/api/status').then(r=>r.json()).then(d=>{
+document.getElementById('currentTemp').textContent=d.temperature+'°C';
+document.getElementById('relayStatus').textContent=d.relay_active?'ON':'OFF';
+document.getElementById('relayStatus').className=d.relay_active?'relay-on':'relay-off';
+document.getElementById('controllerStatus').textContent=d.running?'Running':'Stopped';
+document.getElementById('sensorStatus').textContent=d.sensor_connected?'Connected':'Disconnected';
+}).catch(e=>console.error('Error:',e));}
+function loadConfig(){fetch('/api/config').then(r=>r.json()).then(d=>{
+document.getElementById('tempLow').value=d.temp_low;
+document.getElementById('tempHigh').value=d.temp_high;
+document.getElementById('checkInterval').value=d.check_interval;
+}).catch(e=>console.error('Error:',e));}
+document.getElementById('configForm').addEventListener('submit',function(e){
+e.preventDefault();const fd=new FormData();
+fd.append('temp_low',document.getElementById('tempLow').value);
+fd.append('temp_high',document.getElementById('tempHigh').value);
+fd.append('check_interval',document.getElementById('checkInterval').value);
+fetch('/api/config',{method:'POST',body:fd}).then(r=>r.json()).then(d=>{
+alert('Configuration saved!');loadStatus();}).catch(e=>alert('Error:'+e.message));});
+function controlAction(action){const fd=new FormData();fd.append('action',action);
+fetch('/api/control',{method:'POST',body:fd}).then(r=>r.json()).then(d=>{
+alert('Action executed!');loadStatus();}).catch(e=>alert('Error:'+e.message));}
+</script></body></html>
+)rawliteral";
+
 // Global variables
 AsyncWebServer server(80);
 OneWire oneWire(DS18B20_PIN);
 DallasTemperature sensors(&oneWire);
+DeviceAddress sensorAddress; // ROM code of the sensor, found once at startup
+bool sensorAddressValid = false;
 
 // Configuration variables
 float tempLow = DEFAULT_TEMP_LOW;
 float tempHigh = DEFAULT_TEMP_HIGH;
 int checkInterval = DEFAULT_CHECK_INTERVAL;
+// Set from the AsyncTCP task, read by loop() on the other core
+volatile bool configSavePending = false;
+volatile unsigned long configChangeTime = 0;      // Latest pending change
+volatile unsigned long configFirstChangeTime = 0; // Oldest pending change
+String configJson; // Cached /api/config response, empty when stale
 
 // Status variables
 bool relayActive = false;
 bool running = true;
 float currentTemp = 0.0;
+float lastLoggedTemp = NAN;
 unsigned long lastReadingTime = 0;
 unsigned long lastControlTime = 0;
+int consecutiveErrors = 0;
+
+// Temperature conversion in progress (DS18B20 reads are non-blocking)
+bool conversionPending = false;
+unsigned long conversionStartTime = 0;
 
 // Data logging
 struct DataPoint {
@@ -107,8 +257,9 @@ void setup() {
   // Setup WiFi access point
   setupWiFi();
 
-  // Wait for WiFi to be ready
-  delay(1000);
+  // Wait up to 1 s for the access point to start instead of a fixed delay
+  // (the AP netif has its static IP before the AP is up)
+  WiFi.waitStatusBits(AP_STARTED_BIT, 1000);
 
   // Setup web server
   setupWebServer();
@@ -128,9 +279,34 @@ void setup() {
 void loop() {
   // Temperature control logic runs in main loop
   unsigned long currentTime = millis();
-  if (currentTime - lastControlTime >= checkInterval * 1000) {
-    controlTemperature();
-    lastControlTime = currentTime;
+  if (conversionPending) {
+    if (isConversionDone(currentTime)) {
+      conversionPending = false;
+      controlTemperature();
+    }
+  } else if (currentTime - lastControlTime >= checkInterval * 1000UL) {
+    if (running) {
+      requestTemperature();
+    }
+    // Advance by whole intervals so loop latency does not accumulate as
+    // drift; resynchronise if more than an interval behind (e.g. after the
+    // interval was shortened) instead of firing back-to-back readings
+    lastControlTime += checkInterval * 1000UL;
+    if (currentTime - lastControlTime >= checkInterval * 1000UL) {
+      lastControlTime = currentTime;
+    }
+  }
+
+  // Persist configuration changes once updates have settled, or once the
+  // oldest change has waited too long. Sample the time after reading the
+  // flag: the timestamps may be newer than currentTime
+  if (configSavePending) {
+    unsigned long now = millis();
+    if (now - configChangeTime >= CONFIG_SAVE_DELAY_MS ||
+        now - configFirstChangeTime >= CONFIG_SAVE_MAX_DELAY_MS) {
+      configSavePending = false;
+      saveConfig();
+    }
   }
 
   // Update system status
@@ -142,6 +318,8 @@ void loop() {
 void setupHardware() {
   // Setup DS18B20 sensor
   sensors.begin();
+  // Start conversions without blocking; loop() polls for completion
+  sensors.setWaitForConversion(false);
 
   // Find DS18B20 devices
   int deviceCount = sensors.getDeviceCount();
@@ -152,6 +330,7 @@ void setupHardware() {
   }
   Serial.printf("DS18B20 sensor found: %d devices\n", deviceCount);
   systemStatus.sensorConnected = true;
+  sensorAddressValid = sensors.getAddress(sensorAddress, 0);
 
   // Setup relay
   pinMode(RELAY_PIN, OUTPUT);
@@ -174,121 +353,20 @@ void setupWiFi() {
 void setupWebServer() {
   // Root endpoint that serves inline interface
   server.on("/", HTTP_GET, [](AsyncWebServerRequest *request) {
-    Serial.println("Root endpoint called");
-    Serial.println("Serving inline interface");
-
-    // Create a simple but functional interface
-    String html = "<!DOCTYPE html><html><head><title>ESP32 Temperature "
-                  "Controller</title>";
-    html += "<style>";
-    html += "body{font-family:Arial,sans-serif;margin:20px;background:#f5f5f5}";
-    html += ".container{max-width:800px;margin:0 "
-            "auto;background:white;padding:20px;border-radius:10px}";
-    html += ".header{text-align:center;margin-bottom:30px}";
-    html += ".status-grid{display:grid;grid-template-columns:repeat(auto-fit,"
-            "minmax(200px,1fr));gap:20px;margin-bottom:30px}";
-    html += ".status-card{background:#f8f9fa;padding:20px;border-radius:8px;"
-            "text-align:center}";
-    html += ".temp-display{font-size:2.5em;font-weight:bold;color:#007bff}";
-    html += ".relay-on{color:#28a745;font-weight:bold}";
-    html += ".relay-off{color:#dc3545;font-weight:bold}";
-    html += ".config-section{background:#f8f9fa;padding:20px;border-radius:8px;"
-            "margin-bottom:20px}";
-    html += ".form-group{margin-bottom:15px}";
-    html +=
-        ".form-group label{display:block;margin-bottom:5px;font-weight:bold}";
-    html += ".form-group input{width:100%;padding:8px;border:1px solid "
-            "#ddd;border-radius:4px;box-sizing:border-box}";
-    html +=
-        ".btn{background:#007bff;color:white;padding:10px "
-        "20px;border:none;border-radius:4px;cursor:pointer;margin-right:10px}";
-    html += ".btn-danger{background:#dc3545}";
-    html += ".btn-success{background:#28a745}";
-    html += ".control-buttons{margin-top:20px}";
-    html += "</style></head><body>";
-    html += "<div class='container'>";
-    html += "<div class='header'><h1>🌡️ ESP32 Temperature "
-            "Controller</h1><p>Professional High-Temperature Monitoring "
-            "System</p></div>";
-    html += "<div class='status-grid'>";
-    html += "<div class='status-card'><h3>Current Temperature</h3><div "
-            "class='temp-display' id='currentTemp'>--</div></div>";
-    html += "<div class='status-card'><h3>Relay Status</h3><div "
-            "id='relayStatus'>--</div></div>";
-    html += "<div class='status-card'><h3>Controller</h3><div "
-            "id='controllerStatus'>--</div></div>";
-    html += "<div class='status-card'><h3>Sensor</h3><div "
-            "id='sensorStatus'>--</div></div>";
-    html += "</div>";
-    html += "<div class='config-section'>";
-    html += "<h2>Configuration</h2>";
-    html += "<form id='configForm'>";
-    html += "<div class='form-group'><label for='tempLow'>Temperature Low "
-            "(Activate Relay) °C:</label><input type='number' id='tempLow' "
-            "step='0.1' min='0' max='120' required></div>";
-    html += "<div class='form-group'><label for='tempHigh'>Temperature High "
-            "(Deactivate Relay) °C:</label><input type='number' id='tempHigh' "
-            "step='0.1' min='0' max='120' required></div>";
-    html += "<div class='form-group'><label for='checkInterval'>Reading "
-            "Interval (seconds):</label><input type='number' "
-            "id='checkInterval' min='1' max='60' required></div>";
-    html += "<button type='submit' class='btn'>Save Configuration</button>";
-    html += "<button type='button' class='btn' onclick='loadConfig()'>Load "
-            "Current</button>";
-    html += "</form></div>";
-    html += "<div class='control-buttons'>";
-    html += "<button class='btn btn-success' "
-            "onclick='controlAction(\"start\")'>Start Controller</button>";
-    html += "<button class='btn btn-danger' "
-            "onclick='controlAction(\"stop\")'>Stop Controller</button>";
-    html += "<button class='btn' onclick='controlAction(\"relay_on\")'>Relay "
-            "ON</button>";
-    html += "<button class='btn' onclick='controlAction(\"relay_off\")'>Relay "
-            "OFF</button>";
-    html += "</div></div>";
-    html += "<script>";
-    html += "loadStatus();loadConfig();setInterval(loadStatus,5000);";
-    html += "function "
-            "loadStatus(){fetch('/api/status').then(r=>r.json()).then(d=>{";
-    html += "document.getElementById('currentTemp').textContent=d.temperature+'"
-            "°C';";
-    html += "document.getElementById('relayStatus').textContent=d.relay_active?"
-            "'ON':'OFF';";
-    html += "document.getElementById('relayStatus').className=d.relay_active?'"
-            "relay-on':'relay-off';";
-    html += "document.getElementById('controllerStatus').textContent=d.running?"
-            "'Running':'Stopped';";
-    html += "document.getElementById('sensorStatus').textContent=d.sensor_"
-            "connected?'Connected':'Disconnected';";
-    html += "}).catch(e=>console.error('Error:',e));}";
-    html += "function "
-            "loadConfig(){fetch('/api/config').then(r=>r.json()).then(d=>{";
-    html += "document.getElementById('tempLow').value=d.temp_low;";
-    html += "document.getElementById('tempHigh').value=d.temp_high;";
-    html += "document.getElementById('checkInterval').value=d.check_interval;";
-    html += "}).catch(e=>console.error('Error:',e));}";
-    html += "document.getElementById('configForm').addEventListener('submit',"
-            "function(e){";
-    html += "e.preventDefault();const fd=new FormData();";
-    html += "fd.append('temp_low',document.getElementById('tempLow').value);";
-    html += "fd.append('temp_high',document.getElementById('tempHigh').value);";
-    html += "fd.append('check_interval',document.getElementById('checkInterval'"
-            ").value);";
-    html += "fetch('/api/"
-            "config',{method:'POST',body:fd}).then(r=>r.json()).then(d=>{";
-    html += "alert('Configuration "
-            "saved!');loadStatus();}).catch(e=>alert('Error:'+e.message));});";
-    html += "function controlAction(action){const fd=new "
-            "FormData();fd.append('action',action);";
-    html += "fetch('/api/"
-            "control',{method:'POST',body:fd}).then(r=>r.json()).then(d=>{";
-    html += "alert('Action "
-            "executed!');loadStatus();}).catch(e=>alert('Error:'+e.message));}";
-    html += "</script></body></html>";
-
-    Serial.printf("Sending inline interface, length: %d bytes\n",
-                  html.length());
-    request->send(200, "text/html; charset=utf-8", html);
+    DEBUG_PRINTLN("Root endpoint called");
+    DEBUG_PRINTLN("Serving inline interface");
+    DEBUG_PRINTF("Sending inline interface, length: %d bytes\n",
+                 (int)(sizeof(INDEX_HTML) - 1));
+    request->send_P(200, "text/html; charset=utf-8", INDEX_HTML);
+  });
+
+  // Static stylesheet; browsers decompress it and may cache it
+  server.on("/style.css", HTTP_GET, [](AsyncWebServerRequest *request) {
+    AsyncWebServerResponse *response = request->beginResponse_P(
+        200, "text/css", STYLE_CSS_GZ, sizeof(STYLE_CSS_GZ));
+    response->addHeader("Content-Encoding", "gzip");
+    response->addHeader("Cache-Control", "max-age=86400");
+    request->send(response);
   });
 
   // API endpoints
@@ -300,7 +378,7 @@ void setupWebServer() {
 
   // Handle 404
   server.onNotFound([](AsyncWebServerRequest *request) {
-    Serial.printf("404: %s\n", request->url().c_str());
+    DEBUG_PRINTF("404: %s\n", request->url().c_str());
     request->send(404, "text/plain", "File not found");
   });
 
@@ -310,7 +388,8 @@ void setupWebServer() {
 }
 
 void handleApiStatus(AsyncWebServerRequest *request) {
-  DynamicJsonDocument doc(1024);
+  // Fixed-size document on the stack; the keys are literals and need no copy
+  StaticJsonDocument<JSON_OBJECT_SIZE(12)> doc;
   doc["temperature"] = currentTemp;
   doc["relay_active"] = relayActive;
   doc["temp_low"] = tempLow;
@@ -325,19 +404,21 @@ void handleApiStatus(AsyncWebServerRequest *request) {
   doc["errors"] = systemStatus.errors;
 
   String response;
+  response.reserve(measureJson(doc));
   serializeJson(doc, response);
   request->send(200, "application/json", response);
 }
 
 void handleApiConfig(AsyncWebServerRequest *request) {
-  DynamicJsonDocument doc(256);
-  doc["temp_low"] = tempLow;
-  doc["temp_high"] = tempHigh;
-  doc["check_interval"] = checkInterval;
-
-  String response;
-  serializeJson(doc, response);
-  request->send(200, "application/json", response);
+  // The response only changes when the configuration does
+  if (configJson.length() == 0) {
+    DynamicJsonDocument doc(256);
+    doc["temp_low"] = tempLow;
+    doc["temp_high"] = tempHigh;
+    doc["check_interval"] = checkInterval;
+    serializeJson(doc, configJson);
+  }
+  request->send(200, "application/json", configJson);
 }
 
 void handleApiConfigPost(AsyncWebServerRequest *request) {
@@ -358,8 +439,9 @@ void handleApiConfigPost(AsyncWebServerRequest *request) {
       tempLow = newTempLow;
       tempHigh = newTempHigh;
       checkInterval = newCheckInterval;
+      configJson = "";
 
-      saveConfig();
+      scheduleConfigSave();
       Serial.println("Configuration updated via API");
 
       request->send(200, "application/json", "{\"status\":\"success\"}");
@@ -425,19 +507,31 @@ void controlTemperature() {
   if (!running)
     return;
 
-  // Read temperature
-  sensors.requestTemperatures();
-  float temp = sensors.getTempCByIndex(0);
+  // Read temperature (conversion was started by requestTemperature).
+  // Addressing the sensor by ROM code skips the bus search that
+  // getTempCByIndex() runs on every call; getTempC() still checks the
+  // scratchpad CRC.
+  if (!sensorAddressValid) {
+    sensorAddressValid = sensors.getAddress(sensorAddress, 0);
+  }
+  float temp = sensorAddressValid ? sensors.getTempC(sensorAddress)
+                                  : DEVICE_DISCONNECTED_C;
 
   if (temp != DEVICE_DISCONNECTED_C && temp >= MIN_TEMP && temp <= MAX_TEMP) {
     currentTemp = temp;
     lastReadingTime = millis();
     systemStatus.totalReadings++;
+    systemStatus.sensorConnected = true;
+    consecutiveErrors = 0;
 
     // Log data point
     addDataPoint(temp, relayActive);
 
-    Serial.printf("Current temperature: %.1f°C\n", temp);
+    // Only log readings that moved noticeably since the last one logged
+    if (isnan(lastLoggedTemp) || fabs(temp - lastLoggedTemp) >= TEMP_LOG_DELTA) {
+      Serial.printf("Current temperature: %.1f°C\n", temp);
+      lastLoggedTemp = temp;
+    }
 
     // Control logic
     if (temp <= tempLow && !relayActive) {
@@ -463,10 +557,41 @@ void controlTemperature() {
     Serial.println("Failed to read temperature");
     systemStatus.errors++;
     systemStatus.sensorConnected = false;
+
+    // Without valid readings the relay would stay in its last state; fail
+    // safe by switching it off and looking for the sensor again
+    if (++consecutiveErrors >= SENSOR_ERROR_LIMIT) {
+      if (relayActive) {
+        Serial.printf("%d consecutive read failures - Deactivating relay\n",
+                      consecutiveErrors);
+        setRelay(false);
+      }
+      sensorAddressValid = false;
+    }
   }
 }
 
+void requestTemperature() {
+  sensors.requestTemperatures();
+  conversionPending = true;
+  conversionStartTime = millis();
+}
+
+bool isConversionDone(unsigned long currentTime) {
+  // A powered sensor reads back 1 once conversion ends; in parasite power
+  // mode the bus is held high, so fall back to the datasheet conversion time
+  if (!sensors.isParasitePowerMode() && sensors.isConversionComplete()) {
+    return true;
+  }
+  return currentTime - conversionStartTime >=
+         sensors.millisToWaitForConversion(sensors.getResolution());
+}
+
 void setRelay(bool active) {
+  // Nothing to do if the relay is already in the requested state
+  if (active == relayActive)
+    return;
+
   digitalWrite(RELAY_PIN, active ? HIGH : LOW);
   relayActive = active;
   systemStatus.relayWorking = true;
@@ -505,6 +630,7 @@ void loadConfig() {
       tempLow = doc["temp_low"] | DEFAULT_TEMP_LOW;
       tempHigh = doc["temp_high"] | DEFAULT_TEMP_HIGH;
       checkInterval = doc["check_interval"] | DEFAULT_CHECK_INTERVAL;
+      configJson = "";
       Serial.println("Configuration loaded from file");
     } else {
       Serial.println("Error parsing configuration file");
@@ -516,15 +642,42 @@ void loadConfig() {
   }
 }
 
+void scheduleConfigSave() {
+  // Defer the flash write to loop() so rapid updates become a single write.
+  // Publish the timestamps before the flag so loop() never pairs the flag
+  // with a stale time
+  unsigned long now = millis();
+  if (!configSavePending) {
+    configFirstChangeTime = now;
+  }
+  configChangeTime = now;
+  configSavePending = true;
+}
+
 void saveConfig() {
+  DynamicJsonDocument doc(256);
+  doc["temp_low"] = tempLow;
+  doc["temp_high"] = tempHigh;
+  doc["check_interval"] = checkInterval;
+
+  char buffer[256];
+  size_t length = serializeJson(doc, buffer, sizeof(buffer));
+
+  // Skip the flash write if the stored configuration is identical
+  File existing = SPIFFS.open(CONFIG_FILE, "r");
+  if (existing) {
+    char stored[sizeof(buffer)];
+    size_t storedLength = existing.readBytes(stored, sizeof(stored));
+    existing.close();
+    if (storedLength == length && memcmp(stored, buffer, length) == 0) {
+      Serial.println("Configuration unchanged, not saving");
+      return;
+    }
+  }
+
   File file = SPIFFS.open(CONFIG_FILE, "w");
   if (file) {
-    DynamicJsonDocument doc(256);
-    doc["temp_low"] = tempLow;
-    doc["temp_high"] = tempHigh;
-    doc["check_interval"] = checkInterval;
-
-    serializeJson(doc, file);
+    file.write((const uint8_t *)buffer, length);
     file.close();
     Serial.println("Configuration saved");
   } else {
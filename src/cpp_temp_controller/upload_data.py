@@ -6,48 +6,125 @@ Uploads HTML, CSS, and JavaScript files to ESP32's SPIFFS filesystem
 
 import os
 import sys
+import json
+import glob
+import shutil
+import re
+import hashlib
+import struct
+import functools
 import subprocess
 import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def find_esptool():
-    """Find esptool installation"""
-    # Try to find esptool in the current environment
+# Tool discovery cache, keyed by $PATH, the running interpreter and the
+# working directory (cached commands may be relative, e.g. .venv/bin/python)
+TOOL_CACHE_FILE = Path.home() / '.cache' / 'temperature-control' / 'tools.json'
+
+# Baud rate used when a fast upload fails to sync
+SAFE_BAUD_RATE = 115200
+
+# Partition size parsing: a byte count with an optional unit suffix
+_SIZE_RE = re.compile(r'^\s*(\d+)\s*(B|KB|MB|GB)?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+def _tool_cache_key():
+    """Build the cache key for the current environment"""
+    key = os.pathsep.join((os.environ.get('PATH', ''), sys.executable, os.getcwd()))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def _load_tool_cache():
+    """Load cached tool locations, ignoring entries from other environments"""
     try:
-        # First try to use the virtual environment's Python
-        if os.path.exists('.venv/bin/python'):
-            result = subprocess.run(['.venv/bin/python', '-m', 'esptool', 'version'], 
-                                  capture_output=True, text=True, check=True)
-            return '.venv/bin/python -m esptool'
-        elif os.path.exists('venv/bin/python'):
-            result = subprocess.run(['venv/bin/python', '-m', 'esptool', 'version'], 
-                                  capture_output=True, text=True, check=True)
-            return 'venv/bin/python -m esptool'
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    
-    # Try system esptool
+        with open(TOOL_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('path_hash') != _tool_cache_key():
+        return {}
+    return cache
+
+def _save_tool_cache(name, command):
+    """Persist a discovered tool location"""
+    cache = _load_tool_cache()
+    cache['path_hash'] = _tool_cache_key()
+    cache[name] = command
     try:
-        result = subprocess.run(['esptool', 'version'], capture_output=True, text=True, check=True)
-        return 'esptool'
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        TOOL_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(TOOL_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
         pass
+
+@functools.lru_cache(maxsize=None)
+def _command_argv(command):
+    """Split a tool command string into an argv tuple"""
+    return tuple(command.split())
+
+def _tool_argv(name, command):
+    """Build the argv prefix for a discovered tool
     
-    # Try esptool.py
-    try:
-        result = subprocess.run(['esptool.py', 'version'], capture_output=True, text=True, check=True)
-        return 'esptool.py'
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
+    esptool may be a command string such as '.venv/bin/python -m esptool';
+    every other tool is a single executable path, which may contain spaces.
+    """
+    if name == 'esptool':
+        return _command_argv(command)
+    return (command,)
+
+def _tool_still_valid(name, command):
+    """Check that the executable of a cached command still resolves"""
+    executable = _tool_argv(name, command)[0]
+    if os.sep in executable:
+        return os.path.exists(executable)
+    return shutil.which(executable) is not None
+
+def _cached_tool(name):
+    """Decorator: memoize a tool finder in-process and on disk"""
+    def decorator(finder):
+        @functools.lru_cache(maxsize=1)
+        @functools.wraps(finder)
+        def wrapper():
+            command = _load_tool_cache().get(name)
+            if command and _tool_still_valid(name, command):
+                return command
+            command = finder()
+            if command:
+                _save_tool_cache(name, command)
+            return command
+        return wrapper
+    return decorator
+
+@_cached_tool('esptool')
+def find_esptool():
+    """Find esptool installation"""
+    # First try to use the virtual environment's Python, if esptool is
+    # installed in it (checked on disk rather than by starting Python)
+    for venv in ('.venv', 'venv'):
+        venv_python = f'{venv}/bin/python'
+        if (os.path.exists(venv_python) and
+                glob.glob(f'{venv}/lib/python*/site-packages/esptool*')):
+            return f'{venv_python} -m esptool'
+    
+    # Try system esptool, then esptool.py
+    for name in ('esptool', 'esptool.py'):
+        if shutil.which(name):
+            return name
     
     return None
 
+@_cached_tool('mkspiffs')
 def find_mkspiffs():
     """Find mkspiffs tool"""
+    # Try names on $PATH first
+    for name in ('mkspiffs', 'mkspiffs.exe'):
+        path = shutil.which(name)
+        if path:
+            return path
+    
     # Try common locations
     mkspiffs_paths = [
-        'mkspiffs',
-        'mkspiffs.exe',
         '/usr/local/bin/mkspiffs',
         '/usr/bin/mkspiffs',
         'tools/mkspiffs',
@@ -55,31 +132,79 @@ def find_mkspiffs():
     ]
     
     for path in mkspiffs_paths:
-        try:
-            result = subprocess.run([path, '--version'], capture_output=True, text=True, check=True)
+        if os.path.isfile(path) and os.access(path, os.X_OK):
             return path
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
     
     return None
 
+def verify_tool(name, command, version_arg):
+    """Run a tool's version command once to check that it actually works"""
+    try:
+        subprocess.run(_tool_argv(name, command) + (version_arg,),
+                       capture_output=True, text=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
 def parse_size(size_str):
     """Convert human-readable size to bytes"""
-    size_str = size_str.upper().strip()
-    
-    # Handle different size units
-    if size_str.endswith('KB'):
-        return int(size_str[:-2]) * 1024
-    elif size_str.endswith('MB'):
-        return int(size_str[:-2]) * 1024 * 1024
-    elif size_str.endswith('GB'):
-        return int(size_str[:-2]) * 1024 * 1024 * 1024
-    else:
-        # Assume bytes if no unit specified
-        return int(size_str)
-
-def create_spiffs_image(data_dir, output_file, partition_size="1MB"):
+    match = _SIZE_RE.match(size_str)
+    if not match:
+        raise ValueError(f"invalid size: {size_str!r}")
+    return int(match.group(1)) * _SIZE_UNITS[(match.group(2) or '').upper()]
+
+def _walk_files(root):
+    """Yield (path, stat) for every file under root
+    
+    Uses os.scandir so the stat result cached on each DirEntry is reused
+    instead of issuing a second stat() per file.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat()
+
+def _has_data(data_dir):
+    """Check whether data_dir contains at least one non-empty file"""
+    return any(st.st_size for _, st in _walk_files(data_dir))
+
+def _data_dir_digest(data_dir, size_bytes):
+    """Hash the file names, sizes and mtimes under data_dir"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack('<Q', size_bytes))
+    files = sorted((os.path.relpath(path, data_dir).replace(os.sep, '/'), st)
+                   for path, st in _walk_files(data_dir))
+    for relpath, st in files:
+        h.update(relpath.encode())
+        h.update(struct.pack('<Qq', st.st_size, st.st_mtime_ns))
+    return h.hexdigest()
+
+def create_spiffs_image(data_dir, output_file, partition_size="1MB", verify_tools=False,
+                        verbose=False):
     """Create SPIFFS image from data directory"""
+    # Convert partition size to bytes
+    try:
+        size_bytes = parse_size(partition_size)
+    except ValueError:
+        print(f"❌ Invalid partition size format: {partition_size}")
+        print("Supported formats: 1MB, 512KB, 2MB, etc.")
+        return False
+    
+    # Reuse the previous image if the data directory has not changed
+    stamp_file = Path(f"{output_file}.stamp")
+    digest = _data_dir_digest(data_dir, size_bytes)
+    try:
+        if (os.path.getsize(output_file) == size_bytes and
+                stamp_file.read_text().strip() == digest):
+            print(f"✅ Reusing cached SPIFFS image: {output_file}")
+            return True
+    except OSError:
+        pass
+    
     mkspiffs = find_mkspiffs()
     if not mkspiffs:
         print("❌ mkspiffs tool not found!")
@@ -88,12 +213,8 @@ def create_spiffs_image(data_dir, output_file, partition_size="1MB"):
         print("  - Or build from source: https://github.com/igrr/mkspiffs")
         return False
     
-    # Convert partition size to bytes
-    try:
-        size_bytes = parse_size(partition_size)
-    except ValueError:
-        print(f"❌ Invalid partition size format: {partition_size}")
-        print("Supported formats: 1MB, 512KB, 2MB, etc.")
+    if verify_tools and not verify_tool('mkspiffs', mkspiffs, '--version'):
+        print(f"❌ mkspiffs found at {mkspiffs} but failed to run")
         return False
     
     print(f"📦 Creating SPIFFS image: {output_file}")
@@ -109,55 +230,162 @@ def create_spiffs_image(data_dir, output_file, partition_size="1MB"):
             output_file
         ]
         
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # Let mkspiffs write straight to the terminal in verbose mode;
+        # otherwise collect its output on one pipe for error reporting
+        output = None if verbose else subprocess.PIPE
+        stderr = None if verbose else subprocess.STDOUT
+        result = subprocess.run(cmd, check=True, stdout=output, stderr=stderr, text=True)
         print("✅ SPIFFS image created successfully")
+        
+        try:
+            stamp_file.write_text(digest)
+        except OSError:
+            pass
         return True
         
     except subprocess.CalledProcessError as e:
         print(f"❌ Error creating SPIFFS image: {e}")
-        print(f"Command output: {e.stdout}")
-        print(f"Error output: {e.stderr}")
+        if e.stdout:
+            print(f"Command output: {e.stdout}")
         return False
 
-def upload_spiffs_image(image_file, port, baud_rate=115200):
-    """Upload SPIFFS image to ESP32"""
-    esptool = find_esptool()
-    if not esptool:
-        print("❌ esptool not found!")
-        print("Please install esptool:")
-        print("  pip install esptool")
+def _import_esptool():
+    """Import esptool for in-process use, or return None if unavailable"""
+    try:
+        import esptool
+    except ImportError:
+        return None
+    return esptool
+
+def _is_port_open_error(error):
+    """Check whether an in-process esptool error means the port never opened"""
+    try:
+        import serial
+    except ImportError:
         return False
+    # esptool re-raises the pyserial error as a FatalError, so walk the chain
+    while error is not None:
+        if (isinstance(error, serial.SerialException)
+                and 'could not open port' in str(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def _write_flash(esptool, image_file, port, baud_rate, compress=True):
+    """Run esptool write_flash for the SPIFFS partition
     
-    print(f"📤 Uploading SPIFFS image to ESP32")
-    print(f"   Port: {port}")
-    print(f"   Baud rate: {baud_rate}")
-    print(f"   Image: {image_file}")
+    esptool is either the imported module, which is run in-process, or a
+    command string from find_esptool(), which is run as a subprocess.
+    The flasher stub is left enabled so esptool can negotiate its larger
+    block size instead of writing through the ROM loader.
+    
+    Returns (ok, retry): retry is False when a slower attempt cannot help,
+    e.g. a missing image or a port that could not be opened.
+    """
+    if not os.path.isfile(image_file):
+        print(f"❌ SPIFFS image not found: {image_file}")
+        return False, False
+    
+    args = (
+        '--chip', 'esp32',
+        '--port', port,
+        '--baud', str(baud_rate),
+        'write_flash',
+        # Short form: esptool 5 deprecates '--flash_size' but accepts '-fs'
+        '-fs', 'detect',
+        '--compress' if compress else '--no-compress',
+        '0x290000',  # SPIFFS partition offset
+        image_file
+    )
     
+    if not isinstance(esptool, str):
+        try:
+            esptool.main(list(args))
+            return True, False
+        # Like the subprocess path, where any failure is a non-zero exit:
+        # esptool raises FatalError, serial errors, StopIteration, etc.
+        except (Exception, SystemExit) as e:
+            print(f"❌ Error uploading SPIFFS image to {port}: {e}")
+            return False, not _is_port_open_error(e)
+    
+    # Only the exit status is known here, so any failure may be retried
     try:
-        cmd = esptool.split() + [
-            '--chip', 'esp32',
-            '--port', port,
-            '--baud', str(baud_rate),
-            'write_flash',
-            '--no-compress',  # Disable compression
-            '0x290000',  # SPIFFS partition offset
-            image_file
-        ]
+        subprocess.run(_tool_argv('esptool', esptool) + args, check=True)
+        return True, False
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Error uploading SPIFFS image to {port}: {e}")
+        return False, True
+
+def upload_spiffs_image(image_file, port, baud_rate=460800, verify_tools=False):
+    """Upload SPIFFS image to ESP32"""
+    # Prefer running esptool inside this interpreter to skip a second
+    # Python startup; fall back to an external esptool command
+    esptool = _import_esptool()
+    if esptool is None:
+        esptool = find_esptool()
+        if not esptool:
+            print("❌ esptool not found!")
+            print("Please install esptool:")
+            print("  pip install esptool")
+            return False
         
-        result = subprocess.run(cmd, check=True)
-        print("✅ SPIFFS image uploaded successfully")
+        if verify_tools and not verify_tool('esptool', esptool, 'version'):
+            print(f"❌ esptool found ({esptool}) but failed to run")
+            print("Please install esptool:")
+            print("  pip install esptool")
+            return False
+    
+    print(f"📤 Uploading SPIFFS image to ESP32 on {port}")
+    print(f"   Port: {port}")
+    print(f"   Baud rate: {baud_rate}")
+    # Flush so parallel workers do not interleave these lines with esptool
+    print(f"   Image: {image_file}", flush=True)
+    
+    ok, retry = _write_flash(esptool, image_file, port, baud_rate)
+    if ok:
+        print(f"✅ SPIFFS image uploaded successfully to {port}")
         return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error uploading SPIFFS image: {e}")
+    
+    if not retry or baud_rate <= SAFE_BAUD_RATE:
+        return False
+    
+    print(f"⚠️  Upload to {port} at {baud_rate} baud failed")
+    print(f"   Retrying at {SAFE_BAUD_RATE} baud without compression", flush=True)
+    ok, _ = _write_flash(esptool, image_file, port, SAFE_BAUD_RATE, compress=False)
+    if ok:
+        print(f"✅ SPIFFS image uploaded successfully to {port}")
+        return True
+    
+    return False
+
+def upload_to_ports(image_file, ports, baud_rate=460800, verify_tools=False, jobs=None):
+    """Upload the SPIFFS image to one or more ESP32 boards
+    
+    Each port is an independent serial link, so several boards are
+    flashed in parallel worker processes.
+    """
+    if len(ports) == 1:
+        return upload_spiffs_image(image_file, ports[0], baud_rate, verify_tools)
+    
+    upload_one = functools.partial(upload_spiffs_image, image_file,
+                                   baud_rate=baud_rate, verify_tools=verify_tools)
+    with ProcessPoolExecutor(max_workers=jobs or len(ports)) as executor:
+        results = list(executor.map(upload_one, ports))
+    
+    failed = [port for port, ok in zip(ports, results) if not ok]
+    if failed:
+        print(f"❌ Upload failed on: {', '.join(failed)}")
         return False
+    return True
 
 def main():
     parser = argparse.ArgumentParser(description='Upload web interface to ESP32')
     parser.add_argument('--port', '-p', default='/dev/ttyACM0', 
-                       help='Serial port (default: /dev/ttyACM0)')
-    parser.add_argument('--baud', '-b', type=int, default=115200,
-                       help='Baud rate (default: 115200)')
+                       help='Serial port, or a comma-separated list of ports to '
+                            'flash several boards (default: /dev/ttyACM0)')
+    parser.add_argument('--baud', '-b', type=int, default=460800,
+                       help='Baud rate (default: 460800, use 921600 for faster '
+                            'uploads on boards that support it)')
     parser.add_argument('--partition-size', default='1441792',
                        help='SPIFFS partition size in bytes (default: 1441792)')
     parser.add_argument('--data-dir', default='data',
@@ -166,8 +394,17 @@ def main():
                        help='Output image file (default: spiffs.bin)')
     parser.add_argument('--skip-upload', action='store_true',
                        help='Skip upload, only create image')
+    parser.add_argument('--verify-tools', action='store_true',
+                       help='Run each tool once to verify it works before use')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Show mkspiffs output as it runs')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                       help='Number of boards to flash in parallel '
+                            '(default: one per port)')
     
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
     
     # Check if data directory exists
     data_dir = Path(args.data_dir)
@@ -178,13 +415,41 @@ def main():
     print("🚀 ESP32 Temperature Controller - Web Interface Upload")
     print("=" * 60)
     
+    # Nothing to build or upload
+    if not _has_data(str(data_dir)):
+        print(f"⚠️  No non-empty files in data directory: {data_dir}")
+        if args.skip_upload:
+            print("ℹ️  SPIFFS image was not built")
+            return 0
+        # An upload was requested but the board was left untouched
+        print("❌ SPIFFS image was neither built nor uploaded")
+        return 1
+    
+    # Drop repeated ports, keeping order: two workers cannot share a port
+    ports = list(dict.fromkeys(port.strip() for port in args.port.split(',')
+                               if port.strip()))
+    if not ports:
+        print("❌ No serial port given")
+        return 1
+    
+    # Import esptool in the background so its startup cost overlaps the
+    # mkspiffs build instead of following it
+    esptool_import = None
+    if not args.skip_upload:
+        esptool_import = threading.Thread(target=_import_esptool, daemon=True)
+        esptool_import.start()
+    
     # Create SPIFFS image
-    if not create_spiffs_image(str(data_dir), args.image_file, args.partition_size):
+    if not create_spiffs_image(str(data_dir), args.image_file, args.partition_size,
+                               args.verify_tools, args.verbose):
         return 1
     
     # Upload if not skipped
     if not args.skip_upload:
-        if not upload_spiffs_image(args.image_file, args.port, args.baud):
+        # Finish the import before any worker processes are forked
+        esptool_import.join()
+        if not upload_to_ports(args.image_file, ports, args.baud,
+                               args.verify_tools, args.jobs):
             return 1
     
     print("\n🎉 Upload completed successfully!")